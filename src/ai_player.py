@@ -1,11 +1,33 @@
-from copy import deepcopy  # for making temporary copies of Boards and Pieces 
 from board import Board
+from bitboard import BitBoard, BLACK_KING_ROW, RED_KING_ROW
 from piece import Piece
-from coordinate import Coordinate
+from constants import BLACK, RED
+
+
+# What a value stored in the transposition table means. Searches cut short by alpha beta pruning
+# only know a bound on the real value rather than the value itself.
+EXACT = 0
+LOWER_BOUND = 1  # the real value is at least the stored value
+UPPER_BOUND = 2  # the real value is at most the stored value
+
+# Start over with an empty transposition table once it holds this many positions
+MAX_TABLE_SIZE = 500_000
 
 
 class AI:
-    def minimax(self, game_state: Board) -> tuple[Piece, Coordinate]:
+    """
+    Plays checkers using Depth-Limited Minimax with alpha beta pruning.
+
+    Attributes:
+        transposition_table: maps positions that have already been searched to
+            (value, depth, flag, best move) so they are not searched again. It is kept between
+            turns since many positions come up again a move or two later.
+    """
+    def __init__(self):
+        self._transposition_table: dict[tuple[int, int, int, int], tuple] = {}
+
+
+    def minimax(self, game_state: Board) -> tuple[Piece, int]:
         """
         Given a Board, return the best possible move for the AI player
 
@@ -13,178 +35,224 @@ class AI:
             game_state (Board): the Board object the game is being played on
 
         Returns:
-            A tuple consisting of the piece to move and where that piece should be moved
-            in that order.
+            A tuple consisting of the piece to move and the square (row * DIMENSIONS + col) that
+            piece should be moved to in that order.
         """
         if game_state.is_game_over():
             return None
 
-        # Keep track of the best move that can be made and which piece can make that move
-        best_move = None
-        best_piece = None
+        if len(self._transposition_table) > MAX_TABLE_SIZE:
+            self._transposition_table.clear()
+
+        # The search itself runs on a BitBoard so that trying out a move never has to copy the
+        # Board or its Pieces. Each move is made on the one BitBoard and then taken back.
+        state = BitBoard(*game_state.to_bitboard(), game_state.current_turn)
 
-        alpha=float("-inf")  # the best value so far for the max player
-        beta=float("inf")    # the best value so far for the min player
+        # Keep track of the best move that can be made
+        best_move = None
 
         # As part of Depth-Limited Minimax, we limit how far the AI looks ahead to save time
         # 5 moves ahead is fairly quick
         # 6 moves ahead takes slightly longer
         # Anything above 8 is impractical (and not fun) to wait for
         look_moves_ahead = 5
-        match game_state.current_turn:
+
+        # Iterative deepening: search 1 move ahead, then 2, and so on. The shallower searches
+        # are cheap and fill the transposition table with the best moves found so far, which
+        # are tried first by the next search so that alpha beta pruning cuts off more branches.
+        for depth in range(1, look_moves_ahead + 1):
+            alpha=float("-inf")  # the best value so far for the max player
+            beta=float("inf")    # the best value so far for the min player
+
             # Maximizer
-            case "BLACK":
+            if state.turn == BLACK:
                 best_val = float("-inf")
 
-                for piece in game_state.pieces_with_valid_moves(color=game_state.current_turn):
-                    for move in game_state.get_valid_moves(piece):
-                        val = self.__min_value(
-                            self.__result(game_state, piece, move),
-                            alpha,
-                            beta,
-                            depth=look_moves_ahead
-                        )
+                for move in self.__ordered_moves(state, best_move):
+                    king_changes = state.make_move(move)
+                    val = self.__min_value(state, alpha, beta, depth)
+                    state.unmake_move(move, king_changes)
 
-                        # Store the best action available so far
-                        if val > best_val:
-                            best_val = val
-                            best_move = move
-                            best_piece = piece
+                    # Store the best action available so far
+                    if val > best_val:
+                        best_val = val
+                        best_move = move
 
-                        alpha = max(alpha, best_val)
+                    alpha = max(alpha, best_val)
 
             # Minimizer
-            case "RED":
+            elif state.turn == RED:
                 best_val = float("inf")
-                for piece in game_state.pieces_with_valid_moves(color=game_state.current_turn):
-                    for move in game_state.get_valid_moves(piece):
-                        val = self.__max_value(
-                            self.__result(game_state, piece, move),
-                            alpha,
-                            beta,
-                            depth=look_moves_ahead
-                        )
+                for move in self.__ordered_moves(state, best_move):
+                    king_changes = state.make_move(move)
+                    val = self.__max_value(state, alpha, beta, depth)
+                    state.unmake_move(move, king_changes)
+
+                    # Store the best action available so far
+                    if val < best_val:
+                        best_val = val
+                        best_move = move
 
-                        # Store the best action available so far
-                        if val < best_val:
-                            best_val = val
-                            best_move = move
-                            best_piece = piece
+                    beta = min(beta, best_val)
 
-                        beta = min(beta, best_val)
+        if best_move is None:
+            return (None, None)
 
-        return (best_piece, best_move)
+        # Translate the BitBoard move back into the Board's piece and destination
+        start, destination, _ = best_move
+        best_piece = game_state.get_piece(self.__to_square(start))
+        return (best_piece, self.__to_square(destination))
 
 
-    def __min_value(self, game_state, alpha: int, beta: int, depth: int) -> int:
+    def __min_value(self, state: BitBoard, alpha: int, beta: int, depth: int) -> int:
         """
         Find the smallest value of a game state with alpha beta pruning.
         Helper function for minimax()
 
         Args:
-            alpha (int): the best value so far along the game tree for the maximizing player 
+            alpha (int): the best value so far along the game tree for the maximizing player
             beta (int): the best value so far along the game tree for the minimizing player
         """
-        if game_state.is_game_over() or depth == 0:
-            return self.__evaluate(game_state)
+        if state.is_game_over() or depth == 0:
+            return state.evaluate()
+
+        key = (state.black, state.red, state.kings, state.turn)
+        entry = self._transposition_table.get(key)
+        table_move = None
+        if entry is not None:
+            value, entry_depth, flag, table_move = entry
+            if entry_depth >= depth and self.__is_usable(value, flag, alpha, beta):
+                return value
 
         # Initialize with the worst case value to the minimizer so we always do better
         # with the first move so the algorithm can progress
         min_val = float("inf")
-
-        for piece in game_state.pieces_with_valid_moves(game_state.current_turn):
-            for move in game_state.get_valid_moves(piece):
-                min_val = min(
-                    min_val,
-                    self.__max_value(
-                        self.__result(game_state, piece, move),
-                        alpha,
-                        beta,
-                        depth - 1
-                    )
-                )
-
-                # Alpha Beta Pruning
-                beta = min(beta, min_val)
-                if beta <= alpha:
-                    break
-
+        best_move = None
+        original_alpha, original_beta = alpha, beta
+
+        for move in self.__ordered_moves(state, table_move):
+            king_changes = state.make_move(move)
+            val = self.__max_value(state, alpha, beta, depth - 1)
+            state.unmake_move(move, king_changes)
+            if val < min_val:
+                min_val = val
+                best_move = move
+
+            # Alpha Beta Pruning
+            beta = min(beta, min_val)
+            if beta <= alpha:
+                break
+
+        self.__store(key, min_val, depth, original_alpha, original_beta, best_move)
         return min_val
 
 
-    def __max_value(self, game_state, alpha: int, beta: int, depth: int) -> int:
+    def __max_value(self, state: BitBoard, alpha: int, beta: int, depth: int) -> int:
         """
         Find the largest value of a game state with alpha beta pruning.
         Helper function for minimax()
 
         Args:
-            alpha (int): the best value so far along the game tree for the maximizing player 
+            alpha (int): the best value so far along the game tree for the maximizing player
             beta (int): the best value so far along the game tree for the minimizing player
         """
-        if game_state.is_game_over() or depth == 0:
-            return self.__evaluate(game_state)
+        if state.is_game_over() or depth == 0:
+            return state.evaluate()
+
+        key = (state.black, state.red, state.kings, state.turn)
+        entry = self._transposition_table.get(key)
+        table_move = None
+        if entry is not None:
+            value, entry_depth, flag, table_move = entry
+            if entry_depth >= depth and self.__is_usable(value, flag, alpha, beta):
+                return value
 
         # Initialize with the worst case value to the maximizer so we always do better
         # with the first move so the algorithm can progress
         max_val = float("-inf")
-
-        for piece in game_state.pieces_with_valid_moves(game_state.current_turn):
-            for move in game_state.get_valid_moves(piece):
-                max_val = max(
-                    max_val,
-                    self.__min_value(
-                        self.__result(game_state, piece, move),
-                        alpha,
-                        beta,
-                        depth - 1
-                    )
-                )
-
-                # Alpha Beta Pruning
-                alpha = max(alpha, max_val)
-                if beta <= alpha:
-                    break
-
+        best_move = None
+        original_alpha, original_beta = alpha, beta
+
+        for move in self.__ordered_moves(state, table_move):
+            king_changes = state.make_move(move)
+            val = self.__min_value(state, alpha, beta, depth - 1)
+            state.unmake_move(move, king_changes)
+            if val > max_val:
+                max_val = val
+                best_move = move
+
+            # Alpha Beta Pruning
+            alpha = max(alpha, max_val)
+            if beta <= alpha:
+                break
+
+        self.__store(key, max_val, depth, original_alpha, original_beta, best_move)
         return max_val
 
 
-    def __result(self, game_state: Board, piece: Piece, destination: Coordinate) -> Board:
+    def __is_usable(self, value: int, flag: int, alpha: int, beta: int) -> bool:
         """
-        Return a temporary board that results from making action on the given board
+        Check whether a value from the transposition table can be returned as is for a search
+        with the given alpha and beta.
+        """
+        return (
+            flag == EXACT or
+            (flag == LOWER_BOUND and value >= beta) or
+            (flag == UPPER_BOUND and value <= alpha)
+        )
 
-        Args:
-            game_state (Board): the board object the game is played with
-            piece (Piece): the piece to move
-            destination (Coordinate): where the piece should be moved to
 
-        Returns:
-            The temporary board __resulting from making move on the given board. The original board
-            is not altered.
+    def __store(
+        self, key: tuple, value: int, depth: int, alpha: int, beta: int, best_move: tuple
+    ) -> None:
         """
-        # We don't want to alter any part of the given board so we copy the board and piece
-        # since move() changes both of them
-        game_state_copy = deepcopy(game_state)
-        piece_copy = deepcopy(piece)
+        Save the result of searching a position in the transposition table.
 
-        game_state_copy.move(piece_copy, destination)
-        game_state_copy.switch_player()
-        return game_state_copy
+        Args:
+            key (tuple): the position that was searched
+            value (int): the value the search found
+            depth (int): how many moves ahead the search looked
+            alpha (int): alpha when the search of the position started
+            beta (int): beta when the search of the position started
+            best_move (tuple): the best move found, tried first if the position comes up again
+        """
+        if value <= alpha:
+            flag = UPPER_BOUND
+        elif value >= beta:
+            flag = LOWER_BOUND
+        else:
+            flag = EXACT
+        self._transposition_table[key] = (value, depth, flag, best_move)
 
 
-    def __evaluate(self, game_state: Board) -> int:
+    def __ordered_moves(self, state: BitBoard, first_move: tuple | None) -> list[tuple]:
         """
-        Assign a value to each game state based on the idea that Black is the maximizer and RED
-        is the minimizer. A value greater than 0 favors Black while a value less than 0 favors RED.
-        0 means that neither Black nor Red has the advantage.
+        Get the valid moves of a state in the order they should be searched: the best move from
+        an earlier search first, then moves that make a king, then the rest.
+        Captures don't need to be put first since when one is possible, only captures are valid.
 
-        Returns:
-            An integer representing the game state's utility/value.
+        Args:
+            state (BitBoard): the state to get the moves of
+            first_move (tuple | None): the best move found by an earlier search, if any
         """
-        # A king will be worth 3 while a regular piece will be worth 1
-        black_utility = game_state.black_regular_left + (3 * game_state.black_kings_left)
+        king_row = BLACK_KING_ROW if state.turn == BLACK else RED_KING_ROW
+
+        def priority(move: tuple) -> tuple[bool, bool]:
+            start, destination, _ = move
+            makes_king = destination & king_row and not start & state.kings
+            # False sorts before True
+            return (move != first_move, not makes_king)
 
-        # since RED is the minimizing player, have its utility be negative
-        red_utility = -1 * (game_state.red_regular_left + (3 * game_state.red_kings_left))
+        moves = state.moves()
+        moves.sort(key=priority)
+        return moves
 
-        return black_utility + red_utility
 
+    def __to_square(self, bit: int) -> int:
+        """
+        Convert a BitBoard square back into the Board's square number (row * DIMENSIONS + col)
+
+        Args:
+            bit (int): a bitboard with only the square to convert set
+        """
+        return bit.bit_length() - 1
@@ -0,0 +1,216 @@
+from constants import DIMENSIONS, BLACK
+
+
+# Each square of the board is a single bit, numbered row * DIMENSIONS + col. Moving every piece
+# one square diagonally is then just a shift of the whole bitboard.
+ALL_SQUARES = (1 << (DIMENSIONS * DIMENSIONS)) - 1
+
+
+def _columns(*cols: int) -> int:
+    """Return a bitboard with every square in the given columns set"""
+    mask = 0
+    for row in range(DIMENSIONS):
+        for col in cols:
+            mask |= 1 << (row * DIMENSIONS + col)
+    return mask
+
+
+def _row(row: int) -> int:
+    """Return a bitboard with every square in the given row set"""
+    return ((1 << DIMENSIONS) - 1) << (row * DIMENSIONS)
+
+
+# Pieces on these squares can't move (or jump) towards the left/right edge without falling off
+# the board and wrapping around to the other side
+NOT_LEFT_EDGE = ALL_SQUARES & ~_columns(0)
+NOT_LEFT_TWO = ALL_SQUARES & ~_columns(0, 1)
+NOT_RIGHT_EDGE = ALL_SQUARES & ~_columns(DIMENSIONS - 1)
+NOT_RIGHT_TWO = ALL_SQUARES & ~_columns(DIMENSIONS - 2, DIMENSIONS - 1)
+
+# Each direction is (shift, squares that can move one step that way, squares that can jump)
+DOWN_DIRECTIONS = (
+    (DIMENSIONS - 1, NOT_LEFT_EDGE, NOT_LEFT_TWO),     # down-left
+    (DIMENSIONS + 1, NOT_RIGHT_EDGE, NOT_RIGHT_TWO),   # down-right
+)
+UP_DIRECTIONS = (
+    (-(DIMENSIONS + 1), NOT_LEFT_EDGE, NOT_LEFT_TWO),  # up-left
+    (-(DIMENSIONS - 1), NOT_RIGHT_EDGE, NOT_RIGHT_TWO),  # up-right
+)
+
+# Black must reach the bottom row to become a king while Red must reach the top row
+BLACK_KING_ROW = _row(DIMENSIONS - 1)
+RED_KING_ROW = _row(0)
+
+
+def _shift(bits: int, shift: int) -> int:
+    """Shift a bitboard towards higher squares if shift is positive or lower squares otherwise"""
+    return (bits << shift) & ALL_SQUARES if shift > 0 else bits >> -shift
+
+
+class BitBoard:
+    """
+    A compact copy of a Board's position used by the AI. Three integers describe every piece so
+    the AI can generate and make moves with a handful of bitwise operations instead of copying
+    Board and Piece objects.
+
+    Attributes:
+        black (int): a bit set for every square with a black piece on it
+        red (int): a bit set for every square with a red piece on it
+        kings (int): a bit set for every square with a king (of either color) on it
+        turn (int): whose turn it is, either BLACK or RED
+    """
+    __slots__ = ("black", "red", "kings", "turn")
+
+    def __init__(self, black: int, red: int, kings: int, turn: int):
+        self.black = black
+        self.red = red
+        self.kings = kings
+        self.turn = turn
+
+    def _directions(self) -> tuple[int, int, list[tuple[int, int, int, int]]]:
+        """
+        Get what move generation needs to know about the player whose turn it is.
+
+        Returns:
+            (opponent, empty, directions) where opponent and empty are bitboards of the other
+            player's pieces and the empty squares. Each direction is (shift, adjacent mask,
+            jump mask, the player's pieces that can move that way).
+        """
+        if self.turn == BLACK:
+            own, opponent, forward = self.black, self.red, DOWN_DIRECTIONS
+        else:
+            own, opponent, forward = self.red, self.black, UP_DIRECTIONS
+        empty = ALL_SQUARES & ~(self.black | self.red)
+        own_kings = own & self.kings
+
+        # Regular pieces only move forward while kings move in all 4 diagonal directions
+        directions = [(shift, adj, jump, own) for shift, adj, jump in forward]
+        backward = UP_DIRECTIONS if forward is DOWN_DIRECTIONS else DOWN_DIRECTIONS
+        if own_kings:
+            directions += [(shift, adj, jump, own_kings) for shift, adj, jump in backward]
+        return opponent, empty, directions
+
+    def movable_pieces(self) -> int:
+        """
+        Find every piece of the player whose turn it is that has a valid move, all at once
+        rather than piece by piece. If any piece can jump, only the pieces that can jump are
+        included since a jump must be made.
+
+        Returns:
+            A bitboard with the square of each of those pieces set
+        """
+        opponent, empty, directions = self._directions()
+
+        # Walk the empty squares backwards over the pieces that could be jumped to find which
+        # pieces have a jump, and the same with a single step for adjacent moves
+        jumpers = 0
+        for shift, _, jump_mask, movers in directions:
+            jumpers |= movers & jump_mask & _shift(_shift(empty, -shift) & opponent, -shift)
+        if jumpers:
+            return jumpers
+
+        adjacent_movers = 0
+        for shift, adjacent_mask, _, movers in directions:
+            adjacent_movers |= movers & adjacent_mask & _shift(empty, -shift)
+        return adjacent_movers
+
+    def moves(self) -> list[tuple[int, int, int]]:
+        """
+        Get every valid move for the player whose turn it is. If any jump is possible, only jumps
+        are returned since a jump must be made.
+
+        Returns:
+            A list of (start, destination, captured) moves. Each is a bitboard with a single
+            square set, and captured is 0 for adjacent moves.
+        """
+        opponent, empty, directions = self._directions()
+
+        jumps = []
+        for shift, _, jump_mask, movers in directions:
+            jumped = _shift(movers & jump_mask, shift) & opponent
+            destinations = _shift(jumped, shift) & empty
+            while destinations:
+                destination = destinations & -destinations
+                destinations ^= destination
+                start, captured = _shift(destination, -2 * shift), _shift(destination, -shift)
+                jumps.append((start, destination, captured))
+        if jumps:
+            return jumps
+
+        adjacent_moves = []
+        for shift, adjacent_mask, _, movers in directions:
+            destinations = _shift(movers & adjacent_mask, shift) & empty
+            while destinations:
+                destination = destinations & -destinations
+                destinations ^= destination
+                adjacent_moves.append((_shift(destination, -shift), destination, 0))
+        return adjacent_moves
+
+    def make_move(self, move: tuple[int, int, int]) -> int:
+        """
+        Make move on this BitBoard and pass the turn to the other player. Every change is an XOR,
+        so unmake_move() can undo it exactly by applying the same XORs again.
+
+        Args:
+            move (tuple[int, int, int]): a (start, destination, captured) move from moves()
+
+        Returns:
+            The squares whose king status changed, which must be passed to unmake_move()
+        """
+        start, destination, captured = move
+        kings = self.kings
+
+        # Move the king status along with the piece, remove any captured king,
+        # and crown a regular piece that reached the other side
+        king_changes = captured & kings
+        if kings & start:
+            king_changes |= start | destination
+        elif destination & (BLACK_KING_ROW if self.turn == BLACK else RED_KING_ROW):
+            king_changes |= destination
+
+        if self.turn == BLACK:
+            self.black ^= start | destination
+            self.red ^= captured
+        else:
+            self.red ^= start | destination
+            self.black ^= captured
+        self.kings = kings ^ king_changes
+        self.turn ^= 1
+        return king_changes
+
+    def unmake_move(self, move: tuple[int, int, int], king_changes: int) -> None:
+        """
+        Take back a move made with make_move(), giving the turn back to the player who made it.
+
+        Args:
+            move (tuple[int, int, int]): the move that was made
+            king_changes (int): what make_move() returned for the move
+        """
+        start, destination, captured = move
+        self.turn ^= 1
+        if self.turn == BLACK:
+            self.black ^= start | destination
+            self.red ^= captured
+        else:
+            self.red ^= start | destination
+            self.black ^= captured
+        self.kings ^= king_changes
+
+    def is_game_over(self) -> bool:
+        """Return True if either player has no pieces left, False otherwise"""
+        return self.black == 0 or self.red == 0
+
+    def evaluate(self) -> int:
+        """
+        Assign a value to the position based on the idea that Black is the maximizer and Red is
+        the minimizer. A king is worth 3 while a regular piece is worth 1.
+
+        Returns:
+            An integer that is positive if the position favors Black and negative if it favors Red
+        """
+        # Every piece counts once and each king counts 2 more on top of that
+        black_kings = (self.black & self.kings).bit_count()
+        red_kings = (self.red & self.kings).bit_count()
+        black_utility = self.black.bit_count() + 2 * black_kings
+        red_utility = self.red.bit_count() + 2 * red_kings
+        return black_utility - red_utility
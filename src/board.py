@@ -1,58 +1,146 @@
 import pygame
 from constants import BOARD_RED, BOARD_BLACK, PIECE_RED, PIECE_BLACK
-from constants import SQUARE_SIZE, DIMENSIONS
+from constants import SQUARE_SIZE, DIMENSIONS, BLACK, RED, MoveType
 from piece import Piece
-from coordinate import Coordinate
+from bitboard import BitBoard
 
 
 EMPTY = None
 
+# The red squares never change, so their rects (left, top, width, height) are worked out once
+# instead of every time the checkerboard is drawn
+_RED_SQUARES = tuple(
+    (r * SQUARE_SIZE, c * SQUARE_SIZE, SQUARE_SIZE, SQUARE_SIZE)
+    for r in range(DIMENSIONS)
+    for c in range(r % 2, DIMENSIONS, 2)
+)
+
+# The rect (left, top, width, height) of every square, indexed by row * DIMENSIONS + col
+_SQUARE_RECTS = tuple(
+    (c * SQUARE_SIZE, r * SQUARE_SIZE, SQUARE_SIZE, SQUARE_SIZE)
+    for r in range(DIMENSIONS)
+    for c in range(DIMENSIONS)
+)
+
+# The pixel (x, y) at the center of every square, indexed the same way
+_SQUARE_CENTERS = tuple(
+    (c * SQUARE_SIZE + 0.5*SQUARE_SIZE, r * SQUARE_SIZE + 0.5*SQUARE_SIZE)
+    for r in range(DIMENSIONS)
+    for c in range(DIMENSIONS)
+)
+
+
+def _diagonal_squares(row_diffs: tuple[int, ...], distance: int) -> list[list[int]]:
+    """
+    For every square (row * DIMENSIONS + col), list the squares that are distance squares away
+    diagonally in the given row directions and still on the board.
+
+    Args:
+        row_diffs (tuple[int, ...]): 1 to look down the board, -1 to look up, or both
+        distance (int): how many squares away diagonally to look
+    """
+    table = []
+    for square in range(DIMENSIONS * DIMENSIONS):
+        row, col = divmod(square, DIMENSIONS)
+        table.append([
+            (row + row_diff*distance) * DIMENSIONS + (col + col_diff*distance)
+            for row_diff in row_diffs
+            for col_diff in (-1, 1)
+            if (
+                0 <= row + row_diff*distance < DIMENSIONS and
+                0 <= col + col_diff*distance < DIMENSIONS
+            )
+        ])
+    return table
+
+
+def _jump_squares(row_diffs: tuple[int, ...]) -> list[list[tuple[int, int]]]:
+    """
+    For every square, list the (destination, jumped square) pairs of the jumps in the given row
+    directions that land on the board. The jumped square is halfway between the two.
+    """
+    return [
+        [(destination, (square + destination) // 2) for destination in destinations]
+        for square, destinations in enumerate(_diagonal_squares(row_diffs, 2))
+    ]
+
+
+# Where a piece on each square can move to, worked out once so that finding moves is a lookup
+# instead of redoing the arithmetic and bounds checks every time. Black moves down the board,
+# red moves up and kings move both ways.
+_ADJ_BLACK = _diagonal_squares((1,), 1)
+_ADJ_RED = _diagonal_squares((-1,), 1)
+_ADJ_BOTH = _diagonal_squares((1, -1), 1)
+_JUMP_BLACK = _jump_squares((1,))
+_JUMP_RED = _jump_squares((-1,))
+_JUMP_BOTH = _jump_squares((1, -1))
+
+# How each kind of piece, keyed by (side, is_king), is shown when the board is printed
+_PIECE_SYMBOLS = {
+    (BLACK, False): "B",
+    (BLACK, True): "BK",
+    (RED, False): "R",
+    (RED, True): "RK",
+}
+
 
 class Board:
     """Connects the pieces (the Piece class) with the board the user sees.
     
     Attributes:
         size (int): the dimensions of the board. A checkers board is an 8x8 grid
-        board: a 2D array of Pieces used as a simplified representation of the board.
+        board: the Piece (or EMPTY) on each square, in a flat list indexed by row * DIMENSIONS + col
+        bb: the same board as four bitboards, one each for black pieces, black kings, red pieces
+            and red kings (in that order). Bit row * DIMENSIONS + col is set where there is one.
+        pieces_by_side: the Pieces still on the board, grouped by their side (BLACK or RED)
+        dirty (bool): whether anything visible has changed since the board was last drawn
     """
     def __init__(self):
-        self._board = [[EMPTY for _ in range(DIMENSIONS)] for _ in range(DIMENSIONS)]
+        self._flat = [EMPTY] * (DIMENSIONS * DIMENSIONS)
         self.__selected_piece: Piece = EMPTY
-        self._valid_moves: set[Coordinate] = set()
+        # Squares are numbered row * DIMENSIONS + col, so valid moves are stored as ints
+        self._valid_moves: set[int] = set()
+
+        # Indexed by side * 2 + is_king so that a Piece's bitboard can be found from the Piece
+        self.bb = [0, 0, 0, 0]
+
+        # The pieces still on the board for each side (BLACK or RED) so only the (at most) 12
+        # pieces of a side have to be looked at instead of scanning all 64 squares
+        self._pieces_by_side: dict[int, list[Piece]] = {BLACK: [], RED: []}
+
+        # The result of pieces_with_valid_moves() for each side. It only changes when pieces
+        # are placed or moved, so it is reused until then.
+        self._valid_pieces_cache: dict[int, set[Piece]] = {}
+
+        self._current_turn = BLACK
 
-        self.black_regular_left = 12
-        self.black_kings_left = 0
-        self.black_pieces_left = self.black_regular_left + self.black_kings_left
+        # Only a capture can end the game, so this is updated by move() rather than being worked
+        # out every time someone asks
+        self._game_over = False
 
-        self.red_regular_left = 12
-        self.red_kings_left = 0
-        self.red_pieces_left = self.red_regular_left + self.red_kings_left
+        # Nothing has been drawn yet
+        self._dirty = True
 
-        self._current_turn = "BLACK"
+        # The squares that look different since the board was last drawn, so only they have to
+        # be updated on the screen. Everything is updated when the whole window needs it instead.
+        self._dirty_squares: set[int] = set()
+        self._redraw_all = True
+
+        # The checkerboard never changes, so it is drawn once onto this surface the first time
+        # it is needed and copied onto the window from then on
+        self._checkerboard_surface: pygame.Surface | None = None
 
 
     def __str__(self) -> str:
-        board_with_strings = [[" " for _ in range(DIMENSIONS)] for _ in range(DIMENSIONS)]
-        for row in range(DIMENSIONS):
-            for col in range(DIMENSIONS):
-                curr_piece = self.get_piece(Coordinate(row, col))
-                piece_as_string = ""
-                if curr_piece.color == PIECE_RED:
-                    piece_as_string += "R"
-                    if curr_piece.is_king:
-                        piece_as_string += "K"
-                elif curr_piece.color == PIECE_BLACK:
-                    piece_as_string += "B"
-                    if curr_piece.is_king:
-                        piece_as_string += "K"
-                board_with_strings[row][col] = piece_as_string
-
-        board_as_string = ""
-        for row in board_with_strings:
-            line = "".join(row)
-            board_as_string += (f"{line} \n")
-
-        return board_as_string
+        symbols = [
+            " " if piece is EMPTY else _PIECE_SYMBOLS[(piece.side, piece.is_king)]
+            for piece in self._flat
+        ]
+        rows = [
+            "".join(symbols[row * DIMENSIONS:(row + 1) * DIMENSIONS]) + " "
+            for row in range(DIMENSIONS)
+        ]
+        return "\n".join(rows) + "\n"
 
 
     @property
@@ -62,7 +150,15 @@ class Board:
 
     @selected_piece.setter
     def selected_piece(self, piece):
+        # The highlight moves from under the old piece to under the new one. The valid moves are
+        # only shown while a piece is selected, so they may appear or disappear too.
+        if self.__selected_piece is not EMPTY:
+            self.__mark_dirty((self.__selected_piece.square,))
+        if piece is not EMPTY:
+            self.__mark_dirty((piece.square,))
+        self.__mark_dirty(self._valid_moves)
         self.__selected_piece = piece
+        self._dirty = True
 
 
     @property
@@ -71,42 +167,138 @@ class Board:
         return self._current_turn
 
     @current_turn.setter
-    def current_turn(self, next_turn: str):
+    def current_turn(self, next_turn: int):
         self._current_turn = next_turn
 
 
-    def select_piece(self, coord: Coordinate) -> None:
+    @property
+    def valid_moves(self) -> set[int]:
+        """Getter for valid_moves attribute"""
+        return self._valid_moves
+
+    @valid_moves.setter
+    def valid_moves(self, moves: set[int]) -> None:
+        # Both the old and the new valid moves' squares have to be redrawn
+        self.__mark_dirty(self._valid_moves)
+        self._valid_moves = moves
+        self.__mark_dirty(moves)
+
+
+    # The number of pieces each side has left is counted from the bitboards when asked for
+    # rather than kept in counters that every capture and promotion would have to update
+    @property
+    def black_regular_left(self) -> int:
+        """Number of black pieces left that are not kings"""
+        return self.bb[0].bit_count()
+
+    @property
+    def black_kings_left(self) -> int:
+        """Number of black kings left"""
+        return self.bb[1].bit_count()
+
+    @property
+    def black_pieces_left(self) -> int:
+        """Number of black pieces left, kings included"""
+        return (self.bb[0] | self.bb[1]).bit_count()
+
+    @property
+    def red_regular_left(self) -> int:
+        """Number of red pieces left that are not kings"""
+        return self.bb[2].bit_count()
+
+    @property
+    def red_kings_left(self) -> int:
+        """Number of red kings left"""
+        return self.bb[3].bit_count()
+
+    @property
+    def red_pieces_left(self) -> int:
+        """Number of red pieces left, kings included"""
+        return (self.bb[2] | self.bb[3]).bit_count()
+
+
+    @property
+    def dirty(self) -> bool:
+        """Getter for dirty attribute"""
+        return self._dirty
+
+    @dirty.setter
+    def dirty(self, is_dirty: bool) -> None:
+        # Being marked dirty from outside, such as when the window is uncovered, means all of it
+        # has to be updated. Once it has been drawn, nothing is waiting to be updated.
+        self._dirty = is_dirty
+        self._redraw_all = is_dirty
+        if not is_dirty:
+            self._dirty_squares.clear()
+
+
+    def dirty_rects(self) -> list[tuple[int, int, int, int]] | None:
+        """
+        Get the parts of the window that have changed since the board was last drawn so that only
+        they are updated with pygame.display.update()
+
+        Returns:
+            A list of the rects of the squares that changed, or None if the whole window has to be
+            updated, which is what pygame.display.update() does when given None.
+        """
+        if self._redraw_all:
+            return None
+        return [_SQUARE_RECTS[square] for square in self._dirty_squares]
+
+
+    def __mark_dirty(self, squares) -> None:
+        """
+        Note that the given squares look different now so they are updated on the next draw
+
+        Args:
+            squares: the squares (row * DIMENSIONS + col) that changed
+        """
+        self._dirty_squares.update(squares)
+        self._dirty = True
+
+
+    def select_piece(self, square: int) -> None:
         """
-        Make the piece at the given coordinates the selected piece if it is valid
+        Make the piece on the given square the selected piece if it is valid
 
         Args:
-            coord (Coordinate): the location on the board to select
+            square (int): the location on the board to select, row * DIMENSIONS + col
         """
-        self.__selected_piece = self.get_piece(coord)
+        self.selected_piece = self.get_piece(square)
 
 
     def reset_valid_moves(self) -> None:
         """Make the set of valid moves empty"""
-        self._valid_moves = set()
+        self.__mark_dirty(self._valid_moves)
+        self._valid_moves.clear()
 
 
-    def get_piece(self, coord: Coordinate) -> Piece:
+    def get_piece(self, square: int) -> Piece:
         """
-        Returns the piece at the given coordinates' row and col if it exists.
+        Returns the piece on the given square if it exists.
         Otherwise, based on the initialization of the board, it will return EMPTY
 
         Args:
-            coord (Coordinate): the coordinates on the board to get from
+            square (int): the square on the board to get from, row * DIMENSIONS + col
 
         Returns:
-            The piece at the coordinates. Either a valid piece or EMPTY
+            The piece on the square. Either a valid piece or EMPTY
         """
-        return self._board[coord.row][coord.col]
+        return self._flat[square]
 
 
-    def set_board_at(self, coord: Coordinate, piece: Piece) -> None:
-        """Sets board at the given coordinates to piece"""
-        self._board[coord.row][coord.col] = piece
+    def set_board_at(self, square: int, piece: Piece) -> None:
+        """Sets board at the given square (row * DIMENSIONS + col) to piece"""
+        bit = 1 << square
+        old_piece = self._flat[square]
+        if old_piece is not EMPTY:
+            self.bb[old_piece.side * 2 + old_piece.is_king] &= ~bit
+        if piece is not EMPTY:
+            self.bb[piece.side * 2 + piece.is_king] |= bit
+
+        self._flat[square] = piece
+        self._valid_pieces_cache.clear()
+        self.__mark_dirty((square,))
 
 
     def place_starting_pieces(self) -> None:
@@ -115,32 +307,40 @@ class Board:
         for row in range(3):
             for col in range(DIMENSIONS):
                 if (row + col) % 2 == 1:  # place on alternating squares
-                    self.set_board_at(Coordinate(row, col), Piece(row, col, PIECE_BLACK))
+                    piece = Piece(row, col, PIECE_BLACK)
+                    self.set_board_at(row * DIMENSIONS + col, piece)
+                    self._pieces_by_side[BLACK].append(piece)
 
         # Draw the red pieces at the bottom of the board (the last 3 rows)
         for row in range(DIMENSIONS - 3, DIMENSIONS):
             for col in range(DIMENSIONS):
                 if (row + col) % 2 == 1:  # place on alternating squares
-                    self.set_board_at(Coordinate(row, col), Piece(row, col, PIECE_RED))
+                    piece = Piece(row, col, PIECE_RED)
+                    self.set_board_at(row * DIMENSIONS + col, piece)
+                    self._pieces_by_side[RED].append(piece)
 
 
     def draw_checkerboard(self, window: pygame.Surface) -> None:
         """Draw a black and red checkerboard on the given window."""
-        window.fill(BOARD_BLACK)
+        if self._checkerboard_surface is None:
+            board_size = DIMENSIONS * SQUARE_SIZE
+            surface = pygame.Surface((board_size, board_size))
+            surface.fill(BOARD_BLACK)
 
-        # Draw alternating red squares on the black board to make a checkerboard
-        for r in range(DIMENSIONS):
-            for c in range(r % 2, DIMENSIONS, 2):
-                pygame.draw.rect(
-                    surface=window,
-                    color=BOARD_RED,
-                    rect=(
-                        r * SQUARE_SIZE,  # left
-                        c * SQUARE_SIZE,  # top
-                        SQUARE_SIZE,      # width
-                        SQUARE_SIZE       # height
-                    )
-                )
+            # Lock the surface once for all the squares instead of having every draw call lock
+            # and unlock it on its own
+            surface.lock()
+
+            # Draw alternating red squares on the black board to make a checkerboard
+            for square in _RED_SQUARES:
+                pygame.draw.rect(surface=surface, color=BOARD_RED, rect=square)
+
+            surface.unlock()
+
+            # Match the window's pixel format so copying it over each frame is as fast as possible
+            self._checkerboard_surface = surface.convert()
+
+        window.blit(self._checkerboard_surface, (0, 0))
 
 
     def draw(self, window: pygame.Surface) -> None:
@@ -150,125 +350,124 @@ class Board:
         # effectively giving us a clean slate to work with.
         self.draw_checkerboard(window)
 
-        for row in range(DIMENSIONS):
-            for col in range(DIMENSIONS):
-                piece = self.get_piece(Coordinate(row, col))
-                if self.selected_piece is not EMPTY and piece is self.selected_piece:
-                    self.__highlight_selected_piece_tile(window)
-                if piece is not EMPTY:
-                    piece.draw(window)
+        # The highlight goes under the selected piece so it has to be drawn first
+        if self.__selected_piece is not EMPTY:
+            self.__highlight_selected_piece_tile(window)
+        self.draw_pieces(window)
 
 
+    def draw_pieces(self, window: pygame.Surface) -> None:
+        """Draw every piece on the board onto the given window in a single blits() call"""
+        window.blits(
+            [piece.get_blit() for pieces in self._pieces_by_side.values() for piece in pieces],
+            doreturn=False
+        )
 
 
     def draw_valid_moves(self, window: pygame.Surface) -> None:
         """Draw a green circle on the board at each valid move to show it is valid."""
         if self.selected_piece is not EMPTY:
+            window.lock()
             for valid_move in self._valid_moves:
                 pygame.draw.circle(
                     surface=window,
                     color=(0, 240, 0),
-                    center=(
-                        valid_move.col * SQUARE_SIZE + 0.5*SQUARE_SIZE,
-                        valid_move.row * SQUARE_SIZE + 0.5*SQUARE_SIZE
-                    ),
+                    center=_SQUARE_CENTERS[valid_move],
                     radius=15
                 )
+            window.unlock()
 
 
-    def move(self, piece: Piece, destination: Coordinate) -> bool:
+    def move(self, piece: Piece, destination: int) -> MoveType:
         """
         Moves piece to destination and updates the board internally. 
+        The move is checked against the board itself, so the valid moves for piece do not have
+        to be generated first.
 
         Args: 
             piece (Piece): the piece to move
-            destination (Coordinate): the destination of the piece
+            destination (int): the square the piece is moving to, row * DIMENSIONS + col
 
         Returns:
-            True if move was successful, False otherwise
+            The type of move that was made, MoveType.ADJACENT or MoveType.JUMP, if the move was
+            successful so callers don't need to work it out again. MoveType.NONE otherwise.
         """
-        self.get_valid_moves(piece)
-        if destination not in self._valid_moves:
-            return False
-
-        move_type = self.get_move_type(piece, destination)
-        if move_type == "JUMP":
-            row_diff = destination.row - piece.row
-            col_diff = destination.col - piece.col
-            middle_piece_coords = Coordinate(piece.row + row_diff//2, piece.col + col_diff//2)
-            middle_piece = self.get_piece(middle_piece_coords)
-
-            if middle_piece.color == PIECE_BLACK:
-                if middle_piece.is_king:
-                    self.black_kings_left -= 1
-                else:
-                    self.black_regular_left -= 1
-                self.black_pieces_left -= 1
-            else:
-                if middle_piece.is_king:
-                    self.red_kings_left -= 1
-                else:
-                    self.red_regular_left -= 1
-                self.red_pieces_left -= 1
-            self.set_board_at(middle_piece_coords, EMPTY)
-
-        self.set_board_at(piece, EMPTY)  # clear the board at the old position
+        move_info = self.__legal_move_info(piece, destination)
+        if move_info is None:
+            return MoveType.NONE
+
+        move_type, middle_square = move_info
+        if move_type is MoveType.JUMP:
+            middle_piece = self.get_piece(middle_square)
+            self._pieces_by_side[middle_piece.side].remove(middle_piece)
+            self.set_board_at(middle_square, EMPTY)
+            self._game_over = self.black_pieces_left == 0 or self.red_pieces_left == 0
+
+        self.set_board_at(piece.square, EMPTY)  # clear the board at the old position
 
         # update that piece's position with the new row and column
-        piece.row, piece.col = destination.row, destination.col
+        piece.row, piece.col = divmod(destination, DIMENSIONS)
 
         self.set_board_at(destination, piece)
 
-        # If the piece is a newly made king, update the number of pieces left
+        # If the piece is a newly made king, move its square from the side's regular pieces to
+        # the side's kings
         if piece.king():
-            if piece.color == PIECE_BLACK:
-                self.black_regular_left -= 1
-                self.black_kings_left += 1
-            else:
-                self.red_regular_left -= 1
-                self.red_kings_left += 1
-        self.black_pieces_left = self.black_regular_left + self.black_kings_left
-        self.red_pieces_left = self.red_regular_left + self.red_kings_left
+            bit = 1 << destination
+            self.bb[piece.side * 2] ^= bit
+            self.bb[piece.side * 2 + 1] ^= bit
 
-        return True
+        return move_type
 
 
-    def get_move_type(self, piece: Piece, destination: Coordinate) -> str | None:
+    def __legal_move_info(
+        self, piece: Piece, destination: int
+    ) -> tuple[MoveType, int | None] | None:
         """
-        Given a Piece and its destination, return whether that move is an
-        adjacent move, jump move, or none.
+        Check that a move is legal for the piece and work out what move() needs to make it.
+        Only the squares the piece could reach are looked at, without building any sets.
 
         Args:
-            piece (Piece): the piece making the potential move
-            destination (Coordinate): where the piece is moving to
+            piece (Piece): the piece to move
+            destination (int): the square the piece is moving to, row * DIMENSIONS + col
 
         Returns:
-            'ADJACENT' if the move is an adjacent move or 'JUMP' if the move jumps a piece.
-            Otherwise, return None.
+            None if the move is not legal. Otherwise (move type, jumped square) where the move
+            type is MoveType.ADJACENT or MoveType.JUMP and the jumped square is None for adjacent
+            moves.
         """
-        row_diff, col_diff = destination.row - piece.row, destination.col - piece.col
-
-        # row_diff must be positive for black since it moves down and negative for red since it
-        # moves up while col diff can be either (+, -) for black and red since they can move
-        # left or right.
-        if abs(col_diff) == 1 and (
-            (piece.is_king) or
-            (piece.color == PIECE_BLACK and row_diff == 1) or
-            (piece.color == PIECE_RED and row_diff == -1)
-        ):
-            return "ADJACENT"
-
-        if abs(col_diff) == 2 and (
-            (piece.is_king) or
-            (piece.color == PIECE_BLACK and row_diff == 2) or
-            (piece.color == PIECE_RED and row_diff == -2)
-        ):
-            return "JUMP"
-
-        return None
-
-
-    def get_single_jumps(self, piece: Piece) -> set[Coordinate]:
+        board = self._flat
+        if board[destination] is not EMPTY:
+            return None
+
+        if piece.is_king:
+            jumps, adjacent = _JUMP_BOTH, _ADJ_BOTH
+        elif piece.side == BLACK:
+            jumps, adjacent = _JUMP_BLACK, _ADJ_BLACK
+        else:
+            jumps, adjacent = _JUMP_RED, _ADJ_RED
+
+        start = piece.square
+        can_jump = False
+        for jump_destination, middle in jumps[start]:
+            # A jump needs an opposing piece to jump over and an empty square to land on
+            middle_piece = board[middle]
+            if (
+                middle_piece is not EMPTY and
+                middle_piece.side != piece.side and
+                board[jump_destination] is EMPTY
+            ):
+                if jump_destination == destination:
+                    return MoveType.JUMP, middle
+                can_jump = True
+
+        # if a jump is possible, it must be made, so an adjacent move is only legal without one
+        if can_jump or destination not in adjacent[start]:
+            return None
+        return MoveType.ADJACENT, None
+
+
+    def get_single_jumps(self, piece: Piece) -> set[int]:
         """
         Get all the valid single jumps for the given piece.
 
@@ -276,29 +475,33 @@ class Board:
             piece (Piece): the piece to inspect jumps for
 
         Returns:
-            A set of Coordinates representing the valid jumps possible with the piece
+            A set of the squares the piece can jump to
         """
-        jump_moves: set[Coordinate] = set()
-        jump_directions = []
-
-        if piece.color == PIECE_BLACK or piece.is_king:
-            jump_directions.append( (2, -2) )  # down-left
-            jump_directions.append( (2, 2) )   # down-right
-        if piece.color == PIECE_RED or piece.is_king:
-            jump_directions.append( (-2, -2) )  # up-left
-            jump_directions.append( (-2, 2) )   # up-right
-
-        for row_diff, col_diff in jump_directions:
-            jump_destination = Coordinate(piece.row + row_diff, piece.col + col_diff)
-            if self.__is_valid_move(piece, jump_destination):
-                jump_moves.add(jump_destination)
+        if piece.is_king:
+            jumps = _JUMP_BOTH
+        elif piece.side == BLACK:
+            jumps = _JUMP_BLACK
+        else:
+            jumps = _JUMP_RED
+
+        board = self._flat
+        jump_moves: set[int] = set()
+        for destination, middle in jumps[piece.square]:
+            # A jump needs an opposing piece to jump over and an empty square to land on
+            middle_piece = board[middle]
+            if (
+                middle_piece is not EMPTY and
+                middle_piece.side != piece.side and
+                board[destination] is EMPTY
+            ):
+                jump_moves.add(destination)
 
         return jump_moves
 
 
 
 
-    def get_valid_moves(self, piece: Piece) -> set[Coordinate]:
+    def get_valid_moves(self, piece: Piece) -> set[int]:
         """
         Given a valid piece, returns all valid moves that piece has available to it.
 
@@ -306,74 +509,65 @@ class Board:
             piece (Piece): Must be a valid piece, meaning not EMPTY
 
         Returns:
-            A set of Coordinates representing all valid moves possible with the piece
+            A set of the squares the piece can move to
         """
-        adjacent_moves = self.__get_adjacent_moves(piece)
-        jump_moves = self.get_single_jumps(piece)
-
-        # if a jump is possible, it must be made
-        if len(jump_moves) > 0:
-            self._valid_moves = jump_moves
+        # The circles for the old valid moves go away and ones for the new valid moves are drawn
+        self.__mark_dirty(self._valid_moves)
 
-        # otherwise, no jumps are possible so take adjacent moves
-        else:
-            self._valid_moves = adjacent_moves
+        # if a jump is possible, it must be made. Otherwise, no jumps are possible so take
+        # adjacent moves, which are only looked for in that case.
+        self._valid_moves = self.get_single_jumps(piece) or self.__get_adjacent_moves(piece)
 
+        self.__mark_dirty(self._valid_moves)
         return self._valid_moves
 
 
-    def pieces_with_valid_moves(self, color) -> set[Piece]:
+    def pieces_with_valid_moves(self, side: int) -> set[Piece]:
         """
-        Return a set of Pieces of the specified color that have valid moves available to it.
+        Return a set of Pieces of the specified side that have valid moves available to them.
 
         Args:
-            color: the color of the piece to search for valid moves, either PIECE_BLACK or PIECE_RED
+            side (int): the side whose pieces to search for valid moves, either BLACK or RED
 
         Returns:
-            A set of Pieces, each with valid moves available to it
+            A set of Pieces, each with valid moves available to it. The set is shared with later
+            calls until the board changes, so it should not be modified.
         """
+        pieces = self._valid_pieces_cache.get(side)
+        if pieces is not None:
+            return pieces
+
+        # The BitBoard finds the squares of every piece that can move with a few shifts of the
+        # whole board, including only pieces that can jump if there are any
+        movable = BitBoard(*self.to_bitboard(), side).movable_pieces()
+        board = self._flat
         pieces = set()
-        if color in [PIECE_BLACK, PIECE_RED]:
-            pass
-        else:
-            color = PIECE_BLACK if color == "BLACK" else PIECE_RED
-
-
-        # See if there are any pieces on the board matching the passed in color
-        # that have available jump moves
-        for r in range(8):
-            for c in range(8):
-                piece = self.get_piece(Coordinate(r, c))
-                if (
-                    piece is not EMPTY and
-                    len(self.get_single_jumps(piece)) > 0 and
-                    piece.color == color
-                ):
-                    pieces.add(piece)
-
-        # There are no pieces with jumps available so just get pieces with valid adjacent moves
-        if len(pieces) == 0:
-            for r in range(8):
-                for c in range(8):
-                    piece = self.get_piece(Coordinate(r, c))
-                    if (
-                        piece is not EMPTY and
-                        len(self.__get_adjacent_moves(piece)) > 0 and
-                        piece.color == color
-                    ):
-                        pieces.add(piece)
+        while movable:
+            square = movable & -movable
+            movable ^= square
+            pieces.add(board[square.bit_length() - 1])
+
+        self._valid_pieces_cache[side] = pieces
         return pieces
 
 
+    def to_bitboard(self) -> tuple[int, int, int]:
+        """
+        Get a compact representation of the pieces on the board for the AI.
+
+        Returns:
+            (black, red, kings), integers with bit row * DIMENSIONS + col set for every square
+            that holds a black piece, a red piece, or a king respectively
+        """
+        black_men, black_kings, red_men, red_kings = self.bb
+        return black_men | black_kings, red_men | red_kings, black_kings | red_kings
+
+
     def switch_player(self) -> None:
-        """Switch whose turn it is. 'BLACK' becomes 'RED' and vice versa."""
+        """Switch whose turn it is. BLACK becomes RED and vice versa."""
         self.selected_piece = EMPTY
         self.reset_valid_moves()
-
-        if self.current_turn == "BLACK":
-            self.current_turn = "RED"
-        else:
-            self.current_turn = "BLACK"
+        self._current_turn ^= 1
 
 
     def is_game_over(self) -> bool:
@@ -383,7 +577,7 @@ class Board:
         Returns:
             True if the game is over and False if it is not.
         """
-        return self.black_pieces_left == 0 or self.red_pieces_left == 0
+        return self._game_over
 
 
     def winner(self) -> str:
@@ -396,48 +590,6 @@ class Board:
         return "BLACK" if self.red_pieces_left == 0 else "RED"
 
 
-    def __is_valid_move(self, piece: Piece, destination: Coordinate) -> bool:
-        """
-        Check whether moving piece to destination is valid while doing necessary error checking.
-
-        Args:
-            piece (Piece): the piece to move
-            destination (Piece): the destination to valid
-
-        Return:
-            True if the move is valid, False otherwise
-        """
-        start = Coordinate(piece.row, piece.col)
-
-        if (
-            # the start or destination is not a valid coordinate
-            (not (start.is_in_bounds() and destination.is_in_bounds())) or
-
-            # there is no valid piece to move or the destination has a piece
-            (piece is EMPTY or self.get_piece(destination) is not EMPTY)
-        ):
-            return False
-
-        if self.get_move_type(piece, destination) == "ADJACENT":
-            return True
-
-        # Jumping Movement
-        row_diff = destination.row - start.row
-        col_diff = destination.col - start.col
-        middle_row = start.row + row_diff // 2
-        middle_col = start.col + col_diff // 2
-        middle_piece = self.get_piece(Coordinate(middle_row, middle_col))
-
-        if (
-            self.get_move_type(piece, destination) == "JUMP" and
-            middle_piece is not EMPTY and
-            middle_piece.color != piece.color
-        ):
-            return True
-
-        return False
-
-
     def __highlight_selected_piece_tile(self, window: pygame.Surface) -> None:
         """
         Draw a yellow tile under the selected piece
@@ -460,7 +612,7 @@ class Board:
         )
 
 
-    def __get_adjacent_moves(self, piece: Piece) -> set[Coordinate]:
+    def __get_adjacent_moves(self, piece: Piece) -> set[int]:
         """
         Given a valid piece, return all possible adjacent moves
     
@@ -468,21 +620,16 @@ class Board:
             piece (Piece): Must be a valid piece, meaning not EMPTY
 
         Returns:
-            A set of Coordinates representing the valid adjacent moves possible with the piece
+            A set of the squares the piece can move to without jumping
         """
-        directions = []
-
-        if piece.color == PIECE_BLACK or piece.is_king:
-            directions.append((1, -1))  # down-left
-            directions.append((1, 1))   # down-right
-        if piece.color == PIECE_RED or piece.is_king:
-            directions.append((-1, -1))  # up-left
-            directions.append((-1, 1))   # up-right
-
-        adjacent_moves = set()
-        for row_diff, col_diff in directions:
-            destination = Coordinate(piece.row + row_diff, piece.col + col_diff)
-            if self.__is_valid_move(piece, destination):
-                adjacent_moves.add(destination)
-
-        return adjacent_moves
+        if piece.is_king:
+            adjacent = _ADJ_BOTH
+        elif piece.side == BLACK:
+            adjacent = _ADJ_BLACK
+        else:
+            adjacent = _ADJ_RED
+
+        board = self._flat
+        return {
+            destination for destination in adjacent[piece.square] if board[destination] is EMPTY
+        }
@@ -1,4 +1,5 @@
 """Constants for checkers"""
+from enum import IntEnum
 
 
 BOARD_RED = (252, 40, 52)
@@ -11,3 +12,14 @@ PIECE_BLACK = (54, 52, 53)
 # window_dimension / DIMENSIONS
 SQUARE_SIZE = 100
 DIMENSIONS = 8  # a Checkers board is an 8x8 grid
+
+# The two sides as numbers, such as for whose turn it is or which team a piece is on
+BLACK = 0
+RED = 1
+
+
+class MoveType(IntEnum):
+    """The kinds of move a piece can make. NONE (not a valid move) is the only falsy one."""
+    NONE = 0
+    ADJACENT = 1
+    JUMP = 2
@@ -10,6 +10,9 @@ class Coordinate:
         row (int): the row of the piece on the checkerboard
         col (int): the column of the piece on the checkerboard
     """
+    # No per-instance __dict__, the same as Piece
+    __slots__ = ("_row", "_col")
+
     def __init__(self, row, col) -> None:
         self._row = row
         self._col = col
@@ -46,8 +49,10 @@ class Coordinate:
         self._col = c
 
     def is_in_bounds(self):
-        """Check whether the coordinates are in the bounds of the board"""
-        # TODO: Get rid of hardcoded 8 and replace with board.SIZE
+        """
+        Check whether the coordinates are in the bounds of the board. Move generation never needs
+        this since the move tables in board.py only hold squares that are on the board.
+        """
         return (
             0 <= self._row < DIMENSIONS and
             0 <= self._col < DIMENSIONS
@@ -1,50 +1,59 @@
 import pygame
-from board import EMPTY, Board, Coordinate
-from constants import PIECE_BLACK, PIECE_RED
+from board import EMPTY, Board
+from constants import SQUARE_SIZE, DIMENSIONS, BLACK, RED, MoveType
 from ai_player import AI
 
 
-WINDOW_SIZE = 800  # one numbers since WINDOW should be square. Represents an 800x800 screen
+# One number since WINDOW should be square. Exactly the size of the board (800x800) so that every
+# click lands on a square and get_board_position_from_click() needs no bounds checks.
+WINDOW_SIZE = DIMENSIONS * SQUARE_SIZE
 FPS = 60
 WINDOW = pygame.display.set_mode((WINDOW_SIZE, WINDOW_SIZE))
 pygame.display.set_caption("Checkers")
 
+# The only events the game reacts to. The busiest events it ignores are blocked so SDL never
+# queues them and pygame never has to turn them into Python objects.
+HANDLED_EVENTS = [pygame.QUIT, pygame.KEYDOWN, pygame.MOUSEBUTTONDOWN, pygame.WINDOWEXPOSED]
+pygame.event.set_blocked([
+    pygame.MOUSEMOTION,
+    pygame.MOUSEBUTTONUP,
+    pygame.MOUSEWHEEL,
+    pygame.KEYUP,
+    pygame.TEXTINPUT
+])
 
-def switch_player(current_turn: str, game_board):
+
+def switch_player(current_turn: int, game_board):
     game_board.selected_piece = EMPTY
     game_board.reset_valid_moves()
-    return "BLACK" if current_turn == "RED" else "RED"
+    return current_turn ^ 1
 
 
-def get_board_position_from_click(mouse_coords: tuple[int, int]):
-    """Given a mouse coordinate, return the corresponding position on the board as a Coordinate.
+def get_board_position_from_click(mouse_coords: tuple[int, int]) -> int:
+    """Given a mouse coordinate, return the corresponding square on the board.
     
     Args:
-        mouse_coords (tuple[int, int]): should be passing in pygame.mouse.get_pos()
-        mouse_coords[0] is the row of the mouse and mouse_coords[1] is the column
+        mouse_coords (tuple[int, int]): the position of the mouse, such as a click event's pos
+        mouse_coords[0] is the x position of the mouse and mouse_coords[1] is the y position
 
     Returns:
-        a Coordinate object representing which tile the mouse is on
+        the number (row * DIMENSIONS + col) of the square the mouse is on
     """
-    # The hundreds digit of the mouse coordinates, mouse_x and mouse_y, correspond to the column
-    # and row respectively the mouse is located in.
-
-    # Subtract whatever needed to make a number cleanly divisible by 100.
-    # Divide that number by 100 to get the hundreds digit.
-    row = (mouse_coords[1] - (mouse_coords[1] % 100)) // 100 if mouse_coords[1] > 100 else 0
-    col = (mouse_coords[0] - (mouse_coords[0] % 100)) // 100 if mouse_coords[0] > 100 else 0
-
-    return Coordinate(row, col)
+    # Mouse coordinates are never negative inside the window, so floor dividing by the size of a
+    # square gives the column (from x) and row (from y) the mouse is located in.
+    mouse_x, mouse_y = mouse_coords
+    return (mouse_y // SQUARE_SIZE) * DIMENSIONS + mouse_x // SQUARE_SIZE
 
 
 def main():
     """Function where main game loop occurs. All classes come together in this function."""
     clock = pygame.time.Clock()
     game_board = Board()
-    ai = AI()
+    # Created on the AI's first turn so that its set up doesn't hold up the window appearing
+    ai = None
 
-    PLAYER_COLOR = "BLACK"
-    AI_COLOR = "RED"
+    PLAYER_COLOR = BLACK
+    AI_COLOR = RED
 
     # 1x per game
     game_board.draw_checkerboard(WINDOW)
@@ -52,38 +61,20 @@ def main():
 
     running = True
     while running:
-        # ensure that the game runs at the same rate regardless of machine performance
-        clock.tick(FPS)
-
-        # Handle game overs
-        is_game_over = game_board.is_game_over()
-        if is_game_over:
-            running = False
-            print(f"The game is over! The winner is {game_board.winner()}")
-            break
-
-        # AI Player
-        if game_board.current_turn == AI_COLOR:
-            ai_piece, ai_destination = ai.minimax(game_board)
-            move_type = game_board.get_move_type(ai_piece, ai_destination)
-            if game_board.move(ai_piece, ai_destination):
-                if move_type == "ADJACENT":
-                    game_board.switch_player()
-                elif move_type == "JUMP":
-                    while True:
-                        possible_jump_moves = game_board.get_single_jumps(ai_piece)
-                        if possible_jump_moves:
-                            game_board.move(ai_piece, possible_jump_moves.pop())
-                        else:
-                            game_board.switch_player()
-                            break
-
-
-        for event in pygame.event.get():
+        # Poll the event queue exactly once per frame, before any of the game logic runs.
+        # pygame filters by type itself, then anything else still queued is dropped. Clearing
+        # without pumping means no new events can arrive (and be lost) between the two calls.
+        events = pygame.event.get(HANDLED_EVENTS)
+        pygame.event.clear(pump=False)
+        for event in events:
             # Close button was pressed in top corner
             if event.type == pygame.QUIT:
                 running = False
 
+            # The window was uncovered so what was drawn on it before needs to be drawn again
+            if event.type == pygame.WINDOWEXPOSED:
+                game_board.dirty = True
+
             if event.type == pygame.KEYDOWN:
                 # Use ESC key to end the game
                 if event.key == pygame.K_ESCAPE:
@@ -91,47 +82,71 @@ def main():
 
             # Handle clicks for both selecting and moving pieces
             if event.type == pygame.MOUSEBUTTONDOWN:
-                mouse_board_coords = get_board_position_from_click(pygame.mouse.get_pos())
-                mouse_piece = game_board.get_piece(mouse_board_coords)
-
-                if PLAYER_COLOR == "BLACK":
-                    player_piece_color = PIECE_BLACK
-                else:
-                    player_piece_color = PIECE_RED
+                mouse_square = get_board_position_from_click(event.pos)
+                mouse_piece = game_board.get_piece(mouse_square)
+                selected_piece = game_board.selected_piece
 
                 # Covers selecting pieces, both when one is not selected and when one is selected
                 # but the player wants to change
                 if (
                     mouse_piece is not EMPTY and
-                    (game_board.current_turn == PLAYER_COLOR and mouse_piece.color == player_piece_color) and
-                    mouse_piece in game_board.pieces_with_valid_moves(player_piece_color)
+                    (game_board.current_turn == PLAYER_COLOR and mouse_piece.side == PLAYER_COLOR) and
+                    mouse_piece in game_board.pieces_with_valid_moves(PLAYER_COLOR)
                 ):
-                    game_board.select_piece(mouse_piece)
-                    game_board.get_valid_moves(game_board.selected_piece)
+                    game_board.selected_piece = mouse_piece
+                    game_board.get_valid_moves(mouse_piece)
 
                 # Moving a selected piece to an empty square
-                elif game_board.selected_piece is not EMPTY and mouse_piece is EMPTY:
-                    move_type = game_board.get_move_type(game_board.selected_piece, mouse_board_coords)
-                    if game_board.move(game_board.selected_piece, mouse_board_coords):
-                        if move_type == "JUMP":
-                            while True:
-                                possible_jump_moves = game_board.get_single_jumps(game_board.selected_piece)
-                                if possible_jump_moves:
-                                    game_board._valid_moves = possible_jump_moves
-                                else:
-                                    game_board.switch_player()
-                                break
+                elif selected_piece is not EMPTY and mouse_piece is EMPTY:
+                    move_type = game_board.move(selected_piece, mouse_square)
+                    if move_type is MoveType.JUMP:
+                        # The player keeps the piece selected and finishes any further jumps
+                        # with later clicks. Their turn only ends when there are none left.
+                        possible_jump_moves = game_board.get_single_jumps(selected_piece)
+                        if possible_jump_moves:
+                            game_board.valid_moves = possible_jump_moves
                         else:
                             game_board.switch_player()
+                            running = not game_board.is_game_over()
+                    elif move_type is MoveType.ADJACENT:
+                        game_board.switch_player()
                     else:
                         game_board.selected_piece = None
 
+        # AI Player
+        if running and game_board.current_turn == AI_COLOR:
+            if ai is None:
+                ai = AI()
+            ai_piece, ai_destination = ai.minimax(game_board)
+            move_type = game_board.move(ai_piece, ai_destination)
+            if move_type is MoveType.ADJACENT:
+                game_board.switch_player()
+            elif move_type is MoveType.JUMP:
+                # Keep jumping with the same piece for as long as it can
+                possible_jump_moves = game_board.get_single_jumps(ai_piece)
+                while possible_jump_moves:
+                    game_board.move(ai_piece, possible_jump_moves.pop())
+                    possible_jump_moves = game_board.get_single_jumps(ai_piece)
+                game_board.switch_player()
+                running = not game_board.is_game_over()
+
+        # Only redraw when something has changed since the last frame
+        if game_board.dirty:
+            # Draw the board first and then the valid moves so they properly show up on the board
+            game_board.draw(WINDOW)
+            # the valid moves are only drawn when a piece is selected
+            game_board.draw_valid_moves(WINDOW)
+            # Only the squares that changed are copied to the screen
+            pygame.display.update(game_board.dirty_rects())
+            game_board.dirty = False
+
+        # ensure that the game runs at the same rate regardless of machine performance
+        clock.tick(FPS)
 
-        # Draw the board first and then the valid moves so that they properly show up on the board
-        game_board.draw(WINDOW)
-        # the valid moves are only drawn when a piece is selected
-        game_board.draw_valid_moves(WINDOW)
-        pygame.display.update()
+    # The game can only end with a jump, so it is only checked after a turn ending in one
+    # rather than every frame
+    if game_board.is_game_over():
+        print(f"The game is over! The winner is {game_board.winner()}")
 
     pygame.quit()
 
@@ -1,7 +1,17 @@
+import os
 import pygame 
-from constants import SQUARE_SIZE, PIECE_BLACK, PIECE_RED
+from constants import SQUARE_SIZE, PIECE_BLACK, PIECE_RED, DIMENSIONS, BLACK, RED
 from coordinate import Coordinate
 
+
+# (side, row) pairs where a piece becomes a king.
+# Black must reach the bottom row while Red must reach the top row.
+_PROMOTION_ROWS = {(BLACK, DIMENSIONS - 1), (RED, 0)}
+
+# Found from this file rather than the working directory so the game can be started from anywhere
+_CROWN_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "assets", "crown.png")
+
+
 class Piece:
     """Represents a piece in checkers.
     
@@ -11,10 +21,24 @@ class Piece:
         is_king (bool): whether the piece is a king or not. This allows for movement in all 4
         diagonal directions
         color (tuple[int]): which team the piece is on, either red or black as RGB. 
+        side (int): which team the piece is on as a number, either BLACK or RED. Cheaper to
+        compare than color, which is only needed for drawing.
         RADIUS (int): the radius of the piece that is drawn on the board
     """
+    # No per-instance __dict__: saves memory on every Piece (including the AI's copies) and
+    # makes attribute access faster
+    __slots__ = ("__row", "__col", "__COLOR", "__side", "__is_king", "__left", "__top")
+
     RADIUS = 38
 
+    # The crown is loaded from disk once and reused for every king on every frame
+    _CROWN_IMAGE: pygame.Surface | None = None
+    _CROWN_OFFSET: tuple[int, int] = (0, 0)  # half the crown's width and height
+
+    # Each kind of piece, keyed by (color, is_king), drawn once onto its own square-sized surface
+    # so that drawing a piece every frame is a single blit
+    _SPRITES: dict[tuple[tuple[int], bool], pygame.Surface] = {}
+
     def __init__(self, row: int, col: int, color: tuple[int]):
         """
         Args:
@@ -25,24 +49,24 @@ class Piece:
         self.__row = row
         self.__col = col
         self.__COLOR = color
+        self.__side = BLACK if color is PIECE_BLACK else RED
         self.__is_king = False
 
-    def __eq__(self, other_piece) -> bool:
-        return (
-            self.row == other_piece.row and
-            self.col == other_piece.col and
-            self.color == other_piece.color and
-            self.is_king == other_piece.is_king
-        )
+        # Pixel coordinates of the top left corner of the piece's square, kept in sync by the row
+        # and col setters so draw() does not have to work them out every frame
+        self.__left = col * SQUARE_SIZE
+        self.__top = row * SQUARE_SIZE
 
-    def __hash__(self) -> int:
-        color_int = 1 if self.color == "PIECE_BLACK" else -1
-        return self.row + self.col + color_int
+    # Pieces are compared and hashed by identity (the object defaults) rather than by value.
+    # Each piece on the board is a single Piece object for the whole game, and its row, col and
+    # is_king change as it moves, which a hash based on them would go stale on.
 
+    # Piece's own methods read the underlying attributes directly rather than going through
+    # the property getters, which are kept for everyone else
     def __str__(self) -> str:
-        color_str = "Black" if self.color == PIECE_BLACK else "Red"
-        piece_type = "King" if self.is_king else "Piece"
-        return f"{color_str} {piece_type} at {Coordinate(self.row, self.col)}"
+        color_str = "Black" if self.__side == BLACK else "Red"
+        piece_type = "King" if self.__is_king else "Piece"
+        return f"{color_str} {piece_type} at {Coordinate(self.__row, self.__col)}"
 
     @property
     def row(self) -> int:
@@ -64,13 +88,25 @@ class Piece:
         """Getter for COLOR attribute"""
         return self.__COLOR
 
+    @property
+    def side(self) -> int:
+        """Getter for side attribute"""
+        return self.__side
+
+    @property
+    def square(self) -> int:
+        """The square the piece is on, numbered row * DIMENSIONS + col"""
+        return self.__row * DIMENSIONS + self.__col
+
     @row.setter
     def row(self, r: int) -> None:
         self.__row = r
+        self.__top = r * SQUARE_SIZE
 
     @col.setter
     def col(self, c: int) -> None:
         self.__col = c
+        self.__left = c * SQUARE_SIZE
 
     @is_king.setter
     def is_king(self, k):
@@ -84,36 +120,77 @@ class Piece:
             True if the piece was made king for the first time, False if the conditions were not
             met or the piece is already a king.
         """
-        is_correct_row = (
-            # Black must reach the bottom row
-            (self.color == PIECE_BLACK and self.row == 7) or
-            # Red must reach the top row
-            (self.color == PIECE_RED and self.row == 0)
-        )
-        if is_correct_row and not self.is_king:
+        if not self.__is_king and (self.__side, self.__row) in _PROMOTION_ROWS:
             self.__is_king = True
-            return self.__is_king
+            return True
         return False
 
     def draw(self, window: pygame.Surface) -> None:
         """Draws the piece on the specified window. If the piece is a king, draw a crown for it"""
-        pygame.draw.circle(
-            surface=window,
-            color=self.__COLOR,
-            center=(
-                self.__col * SQUARE_SIZE + 0.5*SQUARE_SIZE,
-                self.__row * SQUARE_SIZE + 0.5*SQUARE_SIZE
-            ),
-            radius=Piece.RADIUS
-        )
-        if self.is_king:
-            crown_image = pygame.image.load("../assets/crown.png")
-
-            # Draw the crown in the center of the piece
-            crown_image_rect = pygame.Rect(
-                (self.col*SQUARE_SIZE + 0.5*SQUARE_SIZE) - (crown_image.get_width() // 2),  # left
-                (self.row*SQUARE_SIZE + 0.5*SQUARE_SIZE) - (crown_image.get_height() // 2), # top
-                crown_image.get_width(),  # width
-                crown_image.get_height()  # height
+        window.blit(*self.get_blit())
+
+    def get_blit(self) -> tuple[pygame.Surface, tuple[int, int]]:
+        """
+        Get what draw() blits for this piece so that many pieces can be drawn at once with
+        pygame.Surface.blits()
+
+        Returns:
+            The piece's surface and the position of its top left corner on the window
+        """
+        return Piece._get_sprite(self.__COLOR, self.__is_king), (self.__left, self.__top)
+
+    @classmethod
+    def _get_sprite(cls, color: tuple[int], is_king: bool) -> pygame.Surface:
+        """
+        Get the surface showing a piece of the given color and king status. The display mode
+        must already be set.
+
+        Args:
+            color (tuple[int]): which team the piece is, either red or black as RGB
+            is_king (bool): whether to draw a crown on the piece
+        """
+        sprite = cls._SPRITES.get((color, is_king))
+        if sprite is None:
+            cls._render_sprites()
+            sprite = cls._SPRITES[(color, is_king)]
+        return sprite
+
+    @classmethod
+    def _render_sprites(cls) -> None:
+        """
+        Draw every kind of piece onto its own surface. All of them are drawn together the first
+        time any is needed so that the first king of the game doesn't have to load the crown and
+        draw its sprite in the middle of play.
+        """
+        center = SQUARE_SIZE // 2
+        for color in (PIECE_BLACK, PIECE_RED):
+            for is_king in (False, True):
+                sprite = pygame.Surface((SQUARE_SIZE, SQUARE_SIZE), pygame.SRCALPHA)
+                pygame.draw.circle(
+                    surface=sprite,
+                    color=color,
+                    center=(center, center),
+                    radius=cls.RADIUS
+                )
+                if is_king:
+                    crown_image = cls._get_crown()
+                    offset_x, offset_y = cls._CROWN_OFFSET
+
+                    # Draw the crown in the center of the piece
+                    sprite.blit(crown_image, (center - offset_x, center - offset_y))
+
+                cls._SPRITES[(color, is_king)] = sprite.convert_alpha()
+
+    @classmethod
+    def _get_crown(cls) -> pygame.Surface:
+        """
+        Load the crown image the first time it is needed and reuse it afterwards.
+        The display mode must already be set since the image is converted to its pixel format.
+        """
+        if cls._CROWN_IMAGE is None:
+            cls._CROWN_IMAGE = pygame.image.load(_CROWN_PATH).convert_alpha()
+            cls._CROWN_OFFSET = (
+                cls._CROWN_IMAGE.get_width() // 2,
+                cls._CROWN_IMAGE.get_height() // 2
             )
-            window.blit(crown_image, crown_image_rect)
+        return cls._CROWN_IMAGE